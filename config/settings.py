@@ -24,10 +24,14 @@ class Settings(BaseSettings):
     default_language: str = Field("en-US", env="DEFAULT_LANGUAGE")
     audio_sample_rate: int = Field(16000, env="AUDIO_SAMPLE_RATE")
     max_audio_duration: int = Field(60, env="MAX_AUDIO_DURATION")
+    prompt_cache_size: int = Field(1024, env="PROMPT_CACHE_SIZE")
+    profile_sample_rate: float = Field(0.0, env="PROFILE_SAMPLE_RATE")
+    profile_flush_every: int = Field(100, env="PROFILE_FLUSH_EVERY")
 
     # Paths
     audio_samples_dir: Path = BASE_DIR / "data" / "audio_samples"
     results_dir: Path = BASE_DIR / "data" / "results"
+    profiles_dir: Path = BASE_DIR / "data" / "profiles"
     log_file: Path = BASE_DIR / "logs" / "pronunciation_assessment.log"
 
     # Logging
@@ -39,7 +43,7 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8"
     )
 
-    @validator("audio_samples_dir", "results_dir", "log_file", pre=True)
+    @validator("audio_samples_dir", "results_dir", "profiles_dir", "log_file", pre=True)
     def ensure_dirs_exist(cls, v):
         path = Path(v)  # 🛠️ düz string bile gelse Path'e çevir
         path.parent.mkdir(parents=True, exist_ok=True)
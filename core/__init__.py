@@ -2,6 +2,10 @@
 from .assessment_engine import PronunciationAssessmentEngine, AssessmentConfig
 from .language_manager import LanguageManager
 from .audio_handler import AudioHandler
+from .audio_corpus import AudioCorpus, Utterance
+from .corpus_packer import CorpusPacker, CorpusEntry
+from .prompt_registry import PromptRegistry, CompiledPrompt
+from .word_aligner import WordAligner
 from .exceptions import (
     PronunciationAssessmentError,
     AssessmentError,
@@ -15,6 +19,13 @@ __all__ = [
     'AssessmentConfig',
     'LanguageManager',
     'AudioHandler',
+    'AudioCorpus',
+    'Utterance',
+    'CorpusPacker',
+    'CorpusEntry',
+    'PromptRegistry',
+    'CompiledPrompt',
+    'WordAligner',
     'PronunciationAssessmentError',
     'AssessmentError',
     'AudioProcessingError',
@@ -8,7 +8,11 @@ from ..config.settings import settings
 from ..models.assessment_result import PronunciationAssessmentResult
 from .exceptions import AudioProcessingError, AssessmentError
 from .audio_handler import AudioHandler
+from .audio_corpus import Utterance
+from .prompt_registry import PromptRegistry
+from .word_aligner import WordAligner
 from ..utils.logger import logger
+from ..utils.profiler import Profiler
 
 
 @dataclass
@@ -21,59 +25,66 @@ class AssessmentConfig:
 
 
 class PronunciationAssessmentEngine:
-    def __init__(self):
+    def __init__(self, profiler: Optional[Profiler] = None):
         self.speech_config = speechsdk.SpeechConfig(
             subscription=settings.azure_speech_key,
             region=settings.azure_speech_region
         )
         self.audio_handler = AudioHandler()
+        self.prompt_registry = PromptRegistry()
+        self.word_aligner = WordAligner()
+        self.profiler = profiler or Profiler()
         logger.info("Pronunciation Assessment Engine initialized")
 
     def assess_pronunciation(
             self,
-            audio_input: Union[str, bytes],
+            audio_input: Union[str, bytes, Utterance],
             config: AssessmentConfig
     ) -> PronunciationAssessmentResult:
         """Assess pronunciation from audio input"""
         try:
-            # Process audio input
-            audio_data = self.audio_handler.process_audio(audio_input)
-
-            # Create audio stream from memory
-            stream_format = speechsdk.audio.AudioStreamFormat(samples_per_second=settings.audio_sample_rate)
-            audio_stream = speechsdk.audio.PushAudioInputStream(stream_format)
-            audio_stream.write(audio_data)
-            audio_stream.close()
-
-            audio_config = speechsdk.audio.AudioConfig(stream=audio_stream)
-
-            # Configure pronunciation assessment
-            pronunciation_config = speechsdk.PronunciationAssessmentConfig(
-                reference_text=config.reference_text,
-                grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
-                granularity=config.granularity,
-                enable_miscue=config.enable_miscue
-            )
-
-            # Create speech recognizer
-            speech_recognizer = speechsdk.SpeechRecognizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config,
-                language=config.language
-            )
-
-            # Apply pronunciation assessment
-            pronunciation_config.apply_to(speech_recognizer)
-
-            # Perform recognition
-            result = speech_recognizer.recognize_once_async().get()
-
-            if result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                return self._parse_result(result, config)
-            elif result.reason == speechsdk.ResultReason.NoMatch:
-                raise AssessmentError("No speech could be recognized.")
-            else:
-                raise AssessmentError(f"Speech recognition failed: {result.reason}")
+            with self.profiler.request():
+                # Process audio input
+                with self.profiler.stage("process_audio"):
+                    audio_data = self.audio_handler.process_audio(audio_input)
+
+                # Create audio stream from memory
+                stream_format = speechsdk.audio.AudioStreamFormat(samples_per_second=settings.audio_sample_rate)
+                audio_stream = speechsdk.audio.PushAudioInputStream(stream_format)
+                audio_stream.write(audio_data)
+                audio_stream.close()
+
+                audio_config = speechsdk.audio.AudioConfig(stream=audio_stream)
+
+                # Configure pronunciation assessment (memoized per prompt)
+                pronunciation_config = self.prompt_registry.get_assessment_config(
+                    reference_text=config.reference_text,
+                    language=config.language,
+                    granularity=config.granularity,
+                    enable_miscue=config.enable_miscue
+                )
+
+                # Create speech recognizer
+                speech_recognizer = speechsdk.SpeechRecognizer(
+                    speech_config=self.speech_config,
+                    audio_config=audio_config,
+                    language=config.language
+                )
+
+                # Apply pronunciation assessment
+                pronunciation_config.apply_to(speech_recognizer)
+
+                # Perform recognition
+                with self.profiler.stage("recognition"):
+                    result = speech_recognizer.recognize_once_async().get()
+
+                if result.reason == speechsdk.ResultReason.RecognizedSpeech:
+                    with self.profiler.stage("parse_result"):
+                        return self._parse_result(result, config)
+                elif result.reason == speechsdk.ResultReason.NoMatch:
+                    raise AssessmentError("No speech could be recognized.")
+                else:
+                    raise AssessmentError(f"Speech recognition failed: {result.reason}")
 
         except Exception as e:
             logger.error(f"Assessment failed: {str(e)}")
@@ -113,6 +124,16 @@ class PronunciationAssessmentEngine:
                 } for p in word.phonemes] if word.phonemes else []
             })
 
+        # Align recognized words onto reference positions. With miscue enabled
+        # Azure keeps omitted reference words in the list, so skip them and
+        # map word_index back onto the full word list.
+        prompt = self.prompt_registry.compile(config.reference_text, config.language)
+        spoken = [(i, w) for i, w in enumerate(word_results) if w["error_type"] != "Omission"]
+        alignment = self.word_aligner.align(prompt, [w for _, w in spoken])
+        for item in alignment:
+            if item.word_index is not None:
+                item.word_index = spoken[item.word_index][0]
+
         # Create result object
         return PronunciationAssessmentResult(
             accuracy_score=pronunciation_result.accuracy_score,
@@ -123,5 +144,6 @@ class PronunciationAssessmentEngine:
             reference_text=config.reference_text,
             recognized_text=result.text,
             words=word_results,
-            phonemes=phoneme_results if phoneme_results else None
+            phonemes=phoneme_results if phoneme_results else None,
+            alignment=alignment
         )
\ No newline at end of file
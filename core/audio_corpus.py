@@ -0,0 +1,130 @@
+import json
+import mmap
+import os
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from ..utils.logger import logger
+from .exceptions import AudioProcessingError
+
+INDEX_FILE = "index.jsonl"
+SAMPLE_WIDTH = 2  # 16-bit mono PCM
+
+
+@dataclass(frozen=True)
+class Utterance:
+    utterance_id: str
+    shard: str
+    offset: int  # byte offset into the shard
+    length: int  # number of samples
+    sample_rate: int
+    reference_text: Optional[str] = None
+    speaker: Optional[str] = None
+    pcm: Optional[memoryview] = field(default=None, compare=False, repr=False)
+
+    @property
+    def duration(self) -> float:
+        return self.length / self.sample_rate
+
+    def to_index_record(self) -> Dict:
+        return {
+            "id": self.utterance_id,
+            "shard": self.shard,
+            "offset": self.offset,
+            "length": self.length,
+            "sample_rate": self.sample_rate,
+            "reference_text": self.reference_text,
+            "speaker": self.speaker
+        }
+
+    @classmethod
+    def from_index_record(cls, record: Dict) -> "Utterance":
+        return cls(
+            utterance_id=record["id"],
+            shard=record["shard"],
+            offset=record["offset"],
+            length=record["length"],
+            sample_rate=record["sample_rate"],
+            reference_text=record.get("reference_text"),
+            speaker=record.get("speaker")
+        )
+
+
+class AudioCorpus:
+    """Read-only view of a packed corpus: PCM shard files plus an index.
+
+    Iterating yields index records in shard and offset order; ``attach`` exposes
+    an utterance's audio as a memoryview slice of its memory-mapped shard, so
+    reading does not copy. Attached utterances must not be used after the corpus
+    is closed.
+    """
+
+    def __init__(self, corpus_dir: Union[str, Path]):
+        self.corpus_dir = Path(corpus_dir)
+        index_path = self.corpus_dir / INDEX_FILE
+        if not index_path.exists():
+            raise AudioProcessingError(f"Corpus index not found: {index_path}")
+
+        with open(index_path, 'r', encoding='utf-8') as f:
+            self.utterances: List[Utterance] = [
+                Utterance.from_index_record(json.loads(line)) for line in f if line.strip()
+            ]
+        self._by_id = {u.utterance_id: i for i, u in enumerate(self.utterances)}
+        self._maps: Dict[str, mmap.mmap] = {}
+        logger.info(f"Audio corpus loaded: {len(self.utterances)} utterances from {self.corpus_dir}")
+
+    @staticmethod
+    def is_corpus(path: Union[str, Path]) -> bool:
+        return (Path(path) / INDEX_FILE).is_file()
+
+    def __len__(self) -> int:
+        return len(self.utterances)
+
+    def __iter__(self) -> Iterator[Utterance]:
+        """Yield index records in shard and offset order for sequential reads"""
+        return iter(sorted(self.utterances, key=lambda u: (u.shard, u.offset)))
+
+    def __getitem__(self, utterance_id: str) -> Utterance:
+        if utterance_id not in self._by_id:
+            raise KeyError(utterance_id)
+        return self.attach(self.utterances[self._by_id[utterance_id]])
+
+    def __enter__(self) -> "AudioCorpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Drop shard mappings; they are unmapped once no utterance views remain"""
+        self._maps.clear()
+
+    def attach(self, utterance: Utterance) -> Utterance:
+        """Return the utterance with its PCM mapped from the shard"""
+        if utterance.length == 0:
+            return replace(utterance, pcm=memoryview(b""))
+
+        end = utterance.offset + utterance.length * SAMPLE_WIDTH
+        shard_map = self._shard_map(utterance.shard)
+        if end > len(shard_map):
+            raise AudioProcessingError(
+                f"Utterance {utterance.utterance_id} exceeds shard {utterance.shard}"
+            )
+        return replace(utterance, pcm=memoryview(shard_map)[utterance.offset:end])
+
+    def _shard_map(self, shard: str) -> mmap.mmap:
+        shard_map = self._maps.get(shard)
+        if shard_map is None:
+            shard_path = self.corpus_dir / shard
+            try:
+                with open(shard_path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        raise AudioProcessingError(f"Corpus shard is empty: {shard_path}")
+                    shard_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except OSError as e:
+                raise AudioProcessingError(f"Cannot map corpus shard {shard_path}: {str(e)}")
+            if hasattr(shard_map, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                shard_map.madvise(mmap.MADV_SEQUENTIAL)
+            self._maps[shard] = shard_map
+        return shard_map
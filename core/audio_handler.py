@@ -8,6 +8,7 @@ from pathlib import Path
 from ..config.settings import settings
 from ..utils.logger import logger
 from .exceptions import AudioProcessingError
+from .audio_corpus import Utterance
 
 
 class AudioHandler:
@@ -16,10 +17,13 @@ class AudioHandler:
         self.max_duration = settings.max_audio_duration
         logger.info("Audio Handler initialized")
 
-    def process_audio(self, audio_input: Union[str, bytes, Path]) -> bytes:
+    def process_audio(self, audio_input: Union[str, bytes, Path, Utterance]) -> bytes:
         """Process audio input and return standardized audio data"""
         try:
-            if isinstance(audio_input, (str, Path)):
+            if isinstance(audio_input, Utterance):
+                # Read from a packed corpus
+                return self._process_utterance(audio_input)
+            elif isinstance(audio_input, (str, Path)):
                 # Read from file
                 return self._process_file(audio_input)
             elif isinstance(audio_input, bytes):
@@ -31,22 +35,42 @@ class AudioHandler:
             logger.error(f"Audio processing failed: {str(e)}")
             raise AudioProcessingError(f"Audio processing failed: {str(e)}")
 
-    def _process_file(self, file_path: Union[str, Path]) -> bytes:
-        """Process audio file"""
+    def load_samples(self, file_path: Union[str, Path]) -> np.ndarray:
+        """Read audio file as mono float32 samples at the configured sample rate"""
         file_path = Path(file_path)
         if not file_path.exists():
             raise AudioProcessingError(f"Audio file not found: {file_path}")
 
         # Read audio file
         data, sr = sf.read(file_path, dtype='float32')
+        data = self._to_mono(data)
 
         # Resample if necessary
         if sr != self.sample_rate:
             data = self._resample_audio(data, sr, self.sample_rate)
 
+        return data
+
+    def _process_file(self, file_path: Union[str, Path]) -> bytes:
+        """Process audio file"""
+        data = self.load_samples(file_path)
+
         # Convert to WAV format in memory
         return self._convert_to_wav_bytes(data, self.sample_rate)
 
+    def _process_utterance(self, utterance: Utterance) -> bytes:
+        """Process a packed corpus utterance without decoding it"""
+        if utterance.pcm is None:
+            raise AudioProcessingError(f"Utterance {utterance.utterance_id} is not attached to a corpus")
+
+        if utterance.sample_rate == self.sample_rate:
+            # Shard PCM is already normalized, wrap the mmap slice as-is
+            return self._wrap_pcm(utterance.pcm, self.sample_rate)
+
+        data = np.frombuffer(utterance.pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        data = self._resample_audio(data, utterance.sample_rate, self.sample_rate)
+        return self._convert_to_wav_bytes(data, self.sample_rate)
+
     def _process_bytes(self, audio_bytes: bytes) -> bytes:
         """Process audio bytes"""
         try:
@@ -70,6 +94,12 @@ class AudioHandler:
 
         return self._convert_to_wav_bytes(data, self.sample_rate)
 
+    def _to_mono(self, data: np.ndarray) -> np.ndarray:
+        """Average multi-channel audio down to mono (output WAV is single channel)"""
+        if data.ndim > 1:
+            return data.mean(axis=1)
+        return data
+
     def _resample_audio(self, data: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
         """Resample audio data using simple linear interpolation"""
         if orig_sr == target_sr:
@@ -89,10 +119,14 @@ class AudioHandler:
 
     def _convert_to_wav_bytes(self, data: np.ndarray, sample_rate: int) -> bytes:
         """Convert numpy array to WAV bytes"""
+        return self._wrap_pcm((data * 32767).astype(np.int16), sample_rate)
+
+    def _wrap_pcm(self, pcm, sample_rate: int) -> bytes:
+        """Wrap 16-bit mono PCM in a WAV container"""
         with io.BytesIO() as wav_buffer:
             with wave.open(wav_buffer, 'wb') as wav_file:
                 wav_file.setnchannels(1)
                 wav_file.setsampwidth(2)
                 wav_file.setframerate(sample_rate)
-                wav_file.writeframes((data * 32767).astype(np.int16))
+                wav_file.writeframes(pcm)
             return wav_buffer.getvalue()
\ No newline at end of file
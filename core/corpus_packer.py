@@ -0,0 +1,210 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..config.settings import settings
+from ..utils.logger import logger
+from .audio_corpus import INDEX_FILE, SAMPLE_WIDTH, Utterance
+from .audio_handler import AudioHandler
+from .exceptions import AudioProcessingError
+
+_worker_handler: Optional[AudioHandler] = None
+
+
+@dataclass
+class CorpusEntry:
+    audio_path: Path
+    utterance_id: str
+    reference_text: Optional[str] = None
+    speaker: Optional[str] = None
+    text_path: Optional[Path] = None  # read for reference_text when it is not given
+
+
+# (pcm, reference_text, error) for one entry
+LoadResult = Tuple[Optional[bytes], Optional[str], Optional[str]]
+
+
+def _load_entry(entry: CorpusEntry) -> LoadResult:
+    """Decode one file to normalized 16-bit PCM and read its reference text"""
+    global _worker_handler
+    if _worker_handler is None:
+        _worker_handler = AudioHandler()
+    try:
+        reference_text = entry.reference_text
+        if reference_text is None and entry.text_path is not None:
+            try:
+                reference_text = entry.text_path.read_text(encoding='utf-8').strip()
+            except FileNotFoundError:
+                pass
+
+        data = _worker_handler.load_samples(entry.audio_path)
+        return (np.clip(data, -1.0, 1.0) * 32767).astype(np.int16).tobytes(), reference_text, None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def _load_batch(entries: List[CorpusEntry]) -> List[LoadResult]:
+    """Load a batch of entries (runs in worker processes)"""
+    return [_load_entry(entry) for entry in entries]
+
+
+class CorpusPacker:
+    """Builds a packed corpus from a directory of WAV files or a JSONL manifest"""
+
+    def __init__(
+            self,
+            output_dir: Union[str, Path],
+            shard_size: int = 512 * 1024 * 1024,
+            workers: Optional[int] = None,
+            chunk_size: int = 64,
+            max_pending: Optional[int] = None
+    ):
+        self.output_dir = Path(output_dir)
+        self.shard_size = shard_size
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # Decoded batches held in memory at once, bounded even if one batch is slow
+        self.max_pending = max_pending or 2 * self.workers
+
+    @staticmethod
+    def entries_from_directory(audio_dir: Union[str, Path]) -> List[CorpusEntry]:
+        """Collect WAV files; reference text comes from a sibling .txt, speaker from the parent folder"""
+        audio_dir = Path(audio_dir)
+        entries = []
+        for audio_file in sorted(audio_dir.rglob("*.wav")):
+            relative = audio_file.relative_to(audio_dir)
+            entries.append(CorpusEntry(
+                audio_path=audio_file,
+                utterance_id=relative.with_suffix("").as_posix(),
+                speaker=relative.parent.name or None,
+                text_path=audio_file.with_suffix(".txt")
+            ))
+        return entries
+
+    @staticmethod
+    def entries_from_manifest(manifest_path: Union[str, Path]) -> List[CorpusEntry]:
+        """Read a JSONL manifest with audio_path and optional id, reference_text, speaker"""
+        manifest_path = Path(manifest_path)
+        entries = []
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                audio_path = Path(record["audio_path"])
+                if not audio_path.is_absolute():
+                    audio_path = manifest_path.parent / audio_path
+                entries.append(CorpusEntry(
+                    audio_path=audio_path,
+                    utterance_id=record.get("id") or audio_path.stem,
+                    reference_text=record.get("reference_text"),
+                    speaker=record.get("speaker")
+                ))
+        return entries
+
+    def pack(self, entries: Iterable[CorpusEntry]) -> int:
+        """Decode entries in parallel and append them to shards in order, return packed count.
+
+        The index is written under a temporary name and moved into place only
+        after every shard is closed, so a failed or interrupted pack never
+        leaves a directory that looks like a complete corpus.
+        """
+        entries = list(entries)
+        self._check_unique_ids(entries)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        index_path = self.output_dir / INDEX_FILE
+        tmp_index_path = self.output_dir / f"{INDEX_FILE}.tmp"
+        # Unpublish any previous corpus here before its shards are overwritten
+        index_path.unlink(missing_ok=True)
+
+        shard_index = -1
+        shard_file = None
+        shard_name = ""
+        total = packed = 0
+        try:
+            with open(tmp_index_path, 'w', encoding='utf-8') as index_file:
+                for entry, (pcm, reference_text, error) in self._load_in_order(entries):
+                    total += 1
+                    if pcm is None:
+                        logger.error(f"Failed to pack {entry.audio_path}: {error}")
+                        continue
+
+                    if shard_file is None or (shard_file.tell() and shard_file.tell() + len(pcm) > self.shard_size):
+                        if shard_file is not None:
+                            shard_file.close()
+                        shard_index += 1
+                        shard_name = f"shard-{shard_index:05d}.pcm"
+                        shard_file = open(self.output_dir / shard_name, 'wb')
+
+                    utterance = Utterance(
+                        utterance_id=entry.utterance_id,
+                        shard=shard_name,
+                        offset=shard_file.tell(),
+                        length=len(pcm) // SAMPLE_WIDTH,
+                        sample_rate=settings.audio_sample_rate,
+                        reference_text=reference_text,
+                        speaker=entry.speaker
+                    )
+                    shard_file.write(pcm)
+                    index_file.write(json.dumps(utterance.to_index_record(), ensure_ascii=False) + "\n")
+                    packed += 1
+        except BaseException:
+            tmp_index_path.unlink(missing_ok=True)
+            raise
+        finally:
+            if shard_file is not None:
+                shard_file.close()
+
+        if total and not packed:
+            tmp_index_path.unlink(missing_ok=True)
+            raise AudioProcessingError("No audio files could be packed")
+
+        os.replace(tmp_index_path, index_path)
+
+        logger.info(f"Packed {packed}/{total} utterances into {shard_index + 1} shards at {self.output_dir}")
+        return packed
+
+    def _load_in_order(self, entries: Iterable[CorpusEntry]) -> Iterator[Tuple[CorpusEntry, LoadResult]]:
+        """Load entries in worker processes, keeping at most max_pending batches in flight"""
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for batch in self._batches(entries):
+                pending.append((batch, executor.submit(_load_batch, batch)))
+                if len(pending) >= self.max_pending:
+                    yield from self._drain_one(pending)
+            while pending:
+                yield from self._drain_one(pending)
+
+    @staticmethod
+    def _check_unique_ids(entries: List[CorpusEntry]) -> None:
+        """Reject duplicate utterance ids before anything is written"""
+        seen_ids = set()
+        for entry in entries:
+            if entry.utterance_id in seen_ids:
+                raise AudioProcessingError(
+                    f"Duplicate utterance id {entry.utterance_id!r} for {entry.audio_path}; "
+                    f"set unique ids in the manifest"
+                )
+            seen_ids.add(entry.utterance_id)
+
+    def _batches(self, entries: Iterable[CorpusEntry]) -> Iterator[List[CorpusEntry]]:
+        batch = []
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= self.chunk_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _drain_one(pending: deque) -> Iterator[Tuple[CorpusEntry, LoadResult]]:
+        batch, future = pending.popleft()
+        yield from zip(batch, future.result())
@@ -0,0 +1,136 @@
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple
+
+import azure.cognitiveservices.speech as speechsdk
+from azure.cognitiveservices.speech import PronunciationAssessmentGranularity
+
+from ..config.settings import settings
+from ..utils.logger import logger
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\w+(?:['’]\w+)*")
+
+# Languages whose dotted/dotless i must be lowered before casefolding
+_TURKIC_LANGUAGES = ("tr", "az")
+
+UNKNOWN_TOKEN_ID = -1
+
+
+def normalize_text(text: str, language: str) -> str:
+    """Normalize text for token comparison (unicode form, case, whitespace)"""
+    text = unicodedata.normalize("NFKC", text)
+    if language.split("-")[0].lower() in _TURKIC_LANGUAGES:
+        text = text.replace("I", "ı").replace("İ", "i")
+    return _WHITESPACE_RE.sub(" ", text.casefold()).strip()
+
+
+def tokenize(text: str, language: str) -> Tuple[str, ...]:
+    """Split text into normalized word tokens, dropping punctuation"""
+    return tuple(_TOKEN_RE.findall(normalize_text(text, language)))
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    language: str
+    reference_text: str
+    tokens: Tuple[str, ...]
+    token_ids: Tuple[int, ...]
+    vocabulary: Dict[str, int] = field(compare=False, repr=False)
+
+    def encode(self, words: Iterable[str]) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Tokenize recognized words like the reference text.
+
+        Returns the token ids and, for each token, the index of the word it
+        came from (a word such as "e-mail" yields several tokens).
+        """
+        token_ids = []
+        word_indexes = []
+        for index, word in enumerate(words):
+            for token in tokenize(word, self.language):
+                token_ids.append(self.vocabulary.get(token, UNKNOWN_TOKEN_ID))
+                word_indexes.append(index)
+        return tuple(token_ids), tuple(word_indexes)
+
+
+class PromptRegistry:
+    """Compiles reference texts once per language and memoizes SDK configs"""
+
+    def __init__(self, max_prompts: Optional[int] = None):
+        self.max_prompts = max_prompts or settings.prompt_cache_size
+        self._prompts: "OrderedDict[Tuple[str, str], CompiledPrompt]" = OrderedDict()
+        self._assessment_configs: "OrderedDict[tuple, speechsdk.PronunciationAssessmentConfig]" = OrderedDict()
+        self._lock = threading.Lock()
+        logger.info("Prompt Registry initialized")
+
+    def compile(self, reference_text: str, language: str) -> CompiledPrompt:
+        """Get the compiled form of a reference text, building it on first use"""
+        reference_text = _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", reference_text)).strip()
+        key = (language, reference_text)
+
+        with self._lock:
+            prompt = self._prompts.get(key)
+            if prompt is not None:
+                self._prompts.move_to_end(key)
+                return prompt
+
+        tokens = tokenize(reference_text, language)
+        vocabulary: Dict[str, int] = {}
+        token_ids = tuple(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+        prompt = CompiledPrompt(
+            language=language,
+            reference_text=reference_text,
+            tokens=tokens,
+            token_ids=token_ids,
+            vocabulary=vocabulary
+        )
+
+        with self._lock:
+            prompt = self._prompts.setdefault(key, prompt)
+            self._prompts.move_to_end(key)
+            self._evict(self._prompts)
+        return prompt
+
+    def get_assessment_config(
+            self,
+            reference_text: str,
+            language: str,
+            granularity: PronunciationAssessmentGranularity = PronunciationAssessmentGranularity.Phoneme,
+            enable_miscue: bool = True
+    ) -> speechsdk.PronunciationAssessmentConfig:
+        """Get a memoized pronunciation assessment config for a reference text"""
+        prompt = self.compile(reference_text, language)
+        key = (prompt.language, prompt.reference_text, granularity, enable_miscue)
+
+        with self._lock:
+            pronunciation_config = self._assessment_configs.get(key)
+            if pronunciation_config is not None:
+                self._assessment_configs.move_to_end(key)
+                return pronunciation_config
+
+        pronunciation_config = speechsdk.PronunciationAssessmentConfig(
+            reference_text=prompt.reference_text,
+            grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
+            granularity=granularity,
+            enable_miscue=enable_miscue
+        )
+
+        with self._lock:
+            pronunciation_config = self._assessment_configs.setdefault(key, pronunciation_config)
+            self._assessment_configs.move_to_end(key)
+            self._evict(self._assessment_configs)
+        return pronunciation_config
+
+    def clear(self) -> None:
+        """Drop all compiled prompts and cached configs"""
+        with self._lock:
+            self._prompts.clear()
+            self._assessment_configs.clear()
+
+    def _evict(self, cache: OrderedDict) -> None:
+        """Drop least recently used entries beyond the size limit"""
+        while len(cache) > self.max_prompts:
+            cache.popitem(last=False)
@@ -0,0 +1,211 @@
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..models.assessment_result import WordAlignment, WordResult
+from .prompt_registry import CompiledPrompt
+
+_DIAGONAL = 0
+_OMISSION = 1
+_INSERTION = 2
+
+# Pads shorter hypotheses in a batch; never equal to a reference token id
+_PAD_ID = -2
+
+WordInput = Union[WordResult, Dict, str]
+
+
+class WordAligner:
+    """Aligns recognized words onto reference positions with banded edit distance"""
+
+    def __init__(self, band_width: int = 8, batch_size: int = 256):
+        self.band_width = band_width
+        self.batch_size = batch_size
+
+    def align(self, prompt: CompiledPrompt, words: Sequence[WordInput]) -> List[WordAlignment]:
+        """Align recognized words against a compiled prompt"""
+        recognized = [self._word_text(word) for word in words]
+        hyp_ids, word_indexes = prompt.encode(recognized)
+        ops = self._edit_operations(prompt.token_ids, hyp_ids)
+        return self._to_alignment(prompt, recognized, hyp_ids, word_indexes, ops)
+
+    def align_batch(
+            self,
+            prompt: CompiledPrompt,
+            word_lists: Sequence[Sequence[WordInput]]
+    ) -> List[List[WordAlignment]]:
+        """Align many recognitions of the same prompt.
+
+        Identical hypotheses are aligned once; the rest are grouped by length and
+        run through the banded edit distance together, one numpy row update per
+        reference token for the whole group.
+        """
+        encoded = []
+        for words in word_lists:
+            recognized = [self._word_text(word) for word in words]
+            encoded.append((recognized,) + prompt.encode(recognized))
+
+        unique_hyps = sorted({hyp_ids for _, hyp_ids, _ in encoded}, key=len)
+        ops_cache: Dict[Tuple[int, ...], List[Tuple[int, int, int]]] = {}
+        for start in range(0, len(unique_hyps), self.batch_size):
+            group = unique_hyps[start:start + self.batch_size]
+            ops_cache.update(zip(group, self._batch_edit_operations(prompt.token_ids, group)))
+
+        return [
+            self._to_alignment(prompt, recognized, hyp_ids, word_indexes, ops_cache[hyp_ids])
+            for recognized, hyp_ids, word_indexes in encoded
+        ]
+
+    def _edit_operations(
+            self,
+            ref_ids: Sequence[int],
+            hyp_ids: Sequence[int]
+    ) -> List[Tuple[int, int, int]]:
+        """Compute (move, ref_index, word_index) edit operations within a diagonal band"""
+        n, m = len(ref_ids), len(hyp_ids)
+        band = max(self.band_width, abs(n - m))
+        width = 2 * band + 1
+        inf = n + m + 1
+
+        # Row i only stores columns i - band .. i + band, indexed by j - i + band
+        costs = [[inf] * width for _ in range(n + 1)]
+        moves = [bytearray(width) for _ in range(n + 1)]
+
+        for i in range(n + 1):
+            row, row_moves = costs[i], moves[i]
+            prev = costs[i - 1] if i else None
+            ref_id = ref_ids[i - 1] if i else None
+            for j in range(max(0, i - band), min(m, i + band) + 1):
+                k = j - i + band
+                if i == 0 and j == 0:
+                    row[k] = 0
+                    continue
+
+                best, move = inf, _DIAGONAL
+                if i and j:
+                    best = prev[k] + (ref_id != hyp_ids[j - 1])
+                if i and k + 1 < width and prev[k + 1] + 1 < best:
+                    best, move = prev[k + 1] + 1, _OMISSION
+                if j and k > 0 and row[k - 1] + 1 < best:
+                    best, move = row[k - 1] + 1, _INSERTION
+                row[k] = best
+                row_moves[k] = move
+
+        return self._backtrack(moves, n, m, band)
+
+    def _batch_edit_operations(
+            self,
+            ref_ids: Sequence[int],
+            hyps: List[Tuple[int, ...]]
+    ) -> List[List[Tuple[int, int, int]]]:
+        """Same as _edit_operations for several hypotheses, vectorized across them.
+
+        Each banded row is computed for all hypotheses at once: diagonal and
+        omission moves are elementwise, and insertions along the row are a
+        running minimum, row[k] = min over k' <= k of (base[k'] + k - k').
+        Shorter hypotheses are padded; cells past a hypothesis' end never lie
+        on its backtrace, and each hypothesis is kept to its own band, so the
+        result matches _edit_operations exactly.
+        """
+        n = len(ref_ids)
+        lengths = [len(hyp) for hyp in hyps]
+        max_len = max(lengths)
+        band = max(self.band_width, max(abs(n - m) for m in lengths))
+        width = 2 * band + 1
+        inf = n + max_len + width + 1
+
+        # Column 0 is a dummy so that padded[:, j] holds hypothesis token j - 1
+        padded = np.full((len(hyps), max_len + 1), _PAD_ID, dtype=np.int64)
+        for b, hyp in enumerate(hyps):
+            padded[b, 1:len(hyp) + 1] = hyp
+
+        offsets = np.arange(width)
+        hyp_bands = np.array([max(self.band_width, abs(n - m)) for m in lengths])
+        in_band = hyp_bands[:, None] >= np.abs(offsets - band)
+        costs = np.full((len(hyps), width), inf, dtype=np.int64)
+        moves = np.zeros((n + 1, len(hyps), width), dtype=np.uint8)
+
+        for i in range(n + 1):
+            columns = offsets + i - band
+            valid = in_band & (columns >= 0) & (columns <= max_len)
+            base = np.full_like(costs, inf)
+            row_moves = moves[i]
+
+            if i == 0:
+                base[:, band] = 0
+            else:
+                prev = costs
+                has_diagonal = valid & (columns >= 1)
+                mismatch = padded[:, np.clip(columns, 0, max_len)] != ref_ids[i - 1]
+                base = np.where(has_diagonal, prev + mismatch, inf)
+
+                up = np.full_like(costs, inf)
+                up[:, :-1] = prev[:, 1:] + 1
+                take_up = valid & (up < base)
+                base = np.where(take_up, up, base)
+                row_moves[take_up] = _OMISSION
+
+            row = np.minimum.accumulate(base - offsets, axis=1) + offsets
+            row_moves[row < base] = _INSERTION
+            costs = np.where(valid, row, inf)
+
+        return [self._backtrack(moves[:, b, :], n, m, band) for b, m in enumerate(lengths)]
+
+    @staticmethod
+    def _backtrack(moves, n: int, m: int, band: int) -> List[Tuple[int, int, int]]:
+        """Follow stored moves back from (n, m) into forward-ordered operations"""
+        ops = []
+        i, j = n, m
+        while i or j:
+            move = moves[i][j - i + band]
+            if move == _DIAGONAL:
+                i, j = i - 1, j - 1
+            elif move == _OMISSION:
+                i -= 1
+            else:
+                j -= 1
+            ops.append((move, i, j))
+        ops.reverse()
+        return ops
+
+    @staticmethod
+    def _to_alignment(
+            prompt: CompiledPrompt,
+            recognized: List[str],
+            hyp_ids: Tuple[int, ...],
+            word_indexes: Tuple[int, ...],
+            ops: List[Tuple[int, int, int]]
+    ) -> List[WordAlignment]:
+        """Turn edit operations over tokens into alignments over the source words"""
+        alignment = []
+        for move, i, j in ops:
+            if move == _DIAGONAL:
+                error_type = "None" if prompt.token_ids[i] == hyp_ids[j] else "Mispronunciation"
+                alignment.append(WordAlignment(
+                    reference_index=i,
+                    word_index=word_indexes[j],
+                    reference_word=prompt.tokens[i],
+                    recognized_word=recognized[word_indexes[j]],
+                    error_type=error_type
+                ))
+            elif move == _OMISSION:
+                alignment.append(WordAlignment(
+                    reference_index=i,
+                    reference_word=prompt.tokens[i],
+                    error_type="Omission"
+                ))
+            else:
+                alignment.append(WordAlignment(
+                    word_index=word_indexes[j],
+                    recognized_word=recognized[word_indexes[j]],
+                    error_type="Insertion"
+                ))
+        return alignment
+
+    @staticmethod
+    def _word_text(word: WordInput) -> str:
+        if isinstance(word, WordResult):
+            return word.word
+        if isinstance(word, dict):
+            return word.get("word", "")
+        return str(word)
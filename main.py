@@ -4,10 +4,12 @@ from typing import Optional
 
 from VoiceAccentChecker.core.assessment_engine import PronunciationAssessmentEngine, AssessmentConfig
 from VoiceAccentChecker.core.language_manager import LanguageManager
+from VoiceAccentChecker.core.audio_corpus import AudioCorpus
 from VoiceAccentChecker.models.assessment_result import PronunciationAssessmentResult
 from VoiceAccentChecker.utils.file_io import FileIO
 from VoiceAccentChecker.utils.display import show_results
 from VoiceAccentChecker.utils.logger import logger
+from VoiceAccentChecker.utils.profiler import Profiler
 from VoiceAccentChecker.config.settings import settings
 
 
@@ -18,21 +20,32 @@ def main():
     )
 
     # Input arguments
-    parser.add_argument("audio_path", help="Path to audio file or directory")
-    parser.add_argument("reference_text", help="Reference text for pronunciation assessment")
+    parser.add_argument("audio_path", help="Path to audio file, directory or packed corpus")
+    parser.add_argument("reference_text", nargs="?",
+                        help="Reference text for pronunciation assessment (optional for packed corpora)")
 
     # Optional arguments
     parser.add_argument("-l", "--language", default=settings.default_language,
                         help="Language code for assessment (e.g., en-US, tr-TR)")
     parser.add_argument("-o", "--output", help="Output file path for results")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write collapsed CPU stacks and per-stage allocation reports")
+    parser.add_argument("--profile-sample-rate", type=float, default=1.0,
+                        help="Fraction of assessments to profile when --profile is set")
+    parser.add_argument("--profile-output", default=str(settings.profiles_dir),
+                        help="Directory for profiling reports (also used for PROFILE_SAMPLE_RATE sampling)")
 
     args = parser.parse_args()
+    if args.profile:
+        profiler = Profiler(sample_rate=args.profile_sample_rate, output_dir=args.profile_output)
+    else:
+        profiler = Profiler(output_dir=args.profile_output)
 
     try:
         # Initialize components
         language_manager = LanguageManager()
-        assessment_engine = PronunciationAssessmentEngine()
+        assessment_engine = PronunciationAssessmentEngine(profiler=profiler)
 
         # Validate language
         if not language_manager.validate_language(args.language):
@@ -48,25 +61,56 @@ def main():
         )
 
         # Perform assessment
-        if audio_path.is_file():
-            result = assessment_engine.assess_pronunciation(str(audio_path), config)
-            show_results(result)
-
-            # Save results
-            if args.output:
-                FileIO.save_results(result.dict(), args.output)
+        if AudioCorpus.is_corpus(audio_path):
+            # Batch processing for packed corpus, read sequentially shard by shard
+            with AudioCorpus(audio_path) as corpus:
+                for utterance in corpus:
+                    try:
+                        print(f"\nProcessing: {utterance.utterance_id}")
+                        utterance = corpus.attach(utterance)
+                        utterance_config = AssessmentConfig(
+                            reference_text=utterance.reference_text or args.reference_text,
+                            language=args.language
+                        )
+                        if not utterance_config.reference_text:
+                            raise ValueError("No reference text in corpus index or arguments")
+
+                        with profiler.request():
+                            result = assessment_engine.assess_pronunciation(utterance, utterance_config)
+                            show_results(result)
+
+                            if args.output:
+                                output_file = f"{utterance.utterance_id.replace('/', '_')}_result.json"
+                                with profiler.stage("file_io"):
+                                    FileIO.save_results(result.dict(), output_file)
+                    except Exception as e:
+                        logger.error(f"Failed to process {utterance.utterance_id}: {str(e)}")
+                        continue
+        elif not args.reference_text:
+            raise ValueError("Reference text is required for audio files and directories.")
+        elif audio_path.is_file():
+            with profiler.request():
+                result = assessment_engine.assess_pronunciation(str(audio_path), config)
+                show_results(result)
+
+                # Save results
+                if args.output:
+                    with profiler.stage("file_io"):
+                        FileIO.save_results(result.dict(), args.output)
         elif audio_path.is_dir():
             # Batch processing for directory
             for audio_file in audio_path.glob("*.wav"):
                 try:
                     print(f"\nProcessing: {audio_file.name}")
-                    result = assessment_engine.assess_pronunciation(str(audio_file), config)
-                    show_results(result)
-
-                    # Save results with same name as audio file
-                    if args.output:
-                        output_file = f"{audio_file.stem}_result.json"
-                        FileIO.save_results(result.dict(), output_file)
+                    with profiler.request():
+                        result = assessment_engine.assess_pronunciation(str(audio_file), config)
+                        show_results(result)
+
+                        # Save results with same name as audio file
+                        if args.output:
+                            output_file = f"{audio_file.stem}_result.json"
+                            with profiler.stage("file_io"):
+                                FileIO.save_results(result.dict(), output_file)
                 except Exception as e:
                     logger.error(f"Failed to process {audio_file.name}: {str(e)}")
                     continue
@@ -76,6 +120,8 @@ def main():
     except Exception as e:
         logger.error(f"Application error: {str(e)}")
         raise
+    finally:
+        profiler.flush()
 
 
 if __name__ == "__main__":
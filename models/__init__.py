@@ -2,11 +2,13 @@
 from .assessment_result import (
     PronunciationAssessmentResult,
     PhonemeResult,
-    WordResult
+    WordResult,
+    WordAlignment
 )
 
 __all__ = [
     'PronunciationAssessmentResult',
     'PhonemeResult',
-    'WordResult'
+    'WordResult',
+    'WordAlignment'
 ]
\ No newline at end of file
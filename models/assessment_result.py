@@ -16,6 +16,14 @@ class WordResult(BaseModel):
     phonemes: Optional[List[Dict[str, Union[str, float]]]] = None
 
 
+class WordAlignment(BaseModel):
+    reference_index: Optional[int] = None
+    word_index: Optional[int] = None
+    reference_word: Optional[str] = None
+    recognized_word: Optional[str] = None
+    error_type: str = "None"
+
+
 class PronunciationAssessmentResult(BaseModel):
     accuracy_score: float = Field(..., ge=0, le=100)
     fluency_score: Optional[float] = Field(None, ge=0, le=100)
@@ -26,6 +34,7 @@ class PronunciationAssessmentResult(BaseModel):
     recognized_text: str
     words: List[WordResult]
     phonemes: Optional[List[PhonemeResult]] = None
+    alignment: Optional[List[WordAlignment]] = None
 
     def overall_score(self) -> float:
         """Calculate weighted overall score"""
@@ -55,6 +64,22 @@ class PronunciationAssessmentResult(BaseModel):
             if word.error_type and word.error_type != "None"
         ]
 
+    def get_local_miscues(self) -> List[Dict]:
+        """Get omissions, insertions and mispronunciations from the local alignment"""
+        if not self.alignment:
+            return []
+
+        return [
+            {
+                "reference_index": item.reference_index,
+                "reference_word": item.reference_word,
+                "recognized_word": item.recognized_word,
+                "error_type": item.error_type
+            }
+            for item in self.alignment
+            if item.error_type != "None"
+        ]
+
     def get_phoneme_accuracy_stats(self) -> Dict[str, float]:
         """Get statistics about phoneme accuracy"""
         if not self.phonemes:
@@ -0,0 +1,45 @@
+import argparse
+from pathlib import Path
+
+from VoiceAccentChecker.core.corpus_packer import CorpusPacker
+from VoiceAccentChecker.utils.logger import logger
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pack audio clips into indexed PCM shards for batch assessment",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument("source", help="Directory of WAV files or JSONL manifest")
+    parser.add_argument("output_dir", help="Directory to write shards and index into")
+
+    parser.add_argument("--shard-size-mb", type=int, default=512, help="Maximum shard size in MiB")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Number of decoding processes")
+
+    args = parser.parse_args()
+
+    try:
+        source = Path(args.source)
+        packer = CorpusPacker(
+            output_dir=args.output_dir,
+            shard_size=args.shard_size_mb * 1024 * 1024,
+            workers=args.workers
+        )
+
+        if source.is_dir():
+            entries = packer.entries_from_directory(source)
+        elif source.is_file():
+            entries = packer.entries_from_manifest(source)
+        else:
+            raise ValueError("Invalid source. Must be a directory or manifest file.")
+
+        packer.pack(entries)
+
+    except Exception as e:
+        logger.error(f"Packing failed: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # utils/__init__.py
 from .file_io import FileIO
 from .logger import logger
+from .profiler import Profiler
 
 
-__all__ = ['FileIO', 'logger']
\ No newline at end of file
+__all__ = ['FileIO', 'logger', 'Profiler']
\ No newline at end of file
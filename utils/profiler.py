@@ -0,0 +1,320 @@
+import atexit
+import random
+import sys
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..config.settings import settings
+from ..utils.logger import logger
+
+_PACKAGE_ROOT = str(Path(__file__).resolve().parent.parent)
+_SKIPPED_FILES = (__file__, "contextlib.py", "threading.py", "tracemalloc.py")
+
+
+class _RequestState:
+    def __init__(self, thread_id: int):
+        self.thread_id = thread_id
+        self.stages: List[str] = ["request"]
+        self.stop_event = threading.Event()
+        self.paused = False
+        self.peak_windows: List[list] = []  # [base, max, valid] traced bytes per open stage
+        self.sampler: Optional[threading.Thread] = None
+
+
+# Thread-local marker for a request that lost the sampling draw
+_UNSAMPLED = object()
+
+
+class Profiler:
+    """Sampling CPU and allocation profiler scoped to assessment stages.
+
+    Only a ``sample_rate`` fraction of requests is profiled; the rest pay for a
+    random draw and a thread-local lookup. Sampled requests record stack samples
+    of the calling thread every ``interval`` seconds and, if ``trace_memory`` is
+    set, tracemalloc diffs (memory retained by the stage) and peak traced memory
+    around each stage. Since tracemalloc is process-wide, allocations of
+    concurrently sampled requests are attributed to each of them, and the peak
+    is reset only while a single request is traced; stages opened while sampled
+    requests overlap record no peak.
+
+    Reports are flushed to ``output_dir`` every ``flush_every`` sampled requests
+    and at interpreter exit, so sampling can stay enabled in long-running services.
+    """
+
+    def __init__(
+            self,
+            sample_rate: Optional[float] = None,
+            interval: float = 0.005,
+            top_n: int = 10,
+            trace_memory: bool = True,
+            include_external: bool = False,
+            output_dir: Optional[Union[str, Path]] = None,
+            flush_every: Optional[int] = None
+    ):
+        self.sample_rate = settings.profile_sample_rate if sample_rate is None else sample_rate
+        self.interval = interval
+        self.top_n = top_n
+        self.trace_memory = trace_memory
+        self.include_external = include_external
+        self.output_dir = Path(output_dir) if output_dir else settings.profiles_dir
+        self.flush_every = settings.profile_flush_every if flush_every is None else flush_every
+
+        self.stack_samples: Counter = Counter()
+        self.allocations: Dict[str, Counter] = defaultdict(Counter)
+        self.allocation_blocks: Dict[str, Counter] = defaultdict(Counter)
+        self.stage_peaks: Counter = Counter()
+        self.stage_peak_totals: Counter = Counter()
+        self.stage_peak_calls: Counter = Counter()
+        self.stage_calls: Counter = Counter()
+        self.sampled_requests = 0
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tracing_requests = 0
+        self._started_tracemalloc = False
+        self._flush_lock = threading.Lock()
+
+        if self.enabled:
+            atexit.register(self.flush)
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    @contextmanager
+    def request(self):
+        """Profile the enclosed request if it is sampled; nested calls reuse the outer decision"""
+        if getattr(self._local, "state", None) is not None:
+            yield
+            return
+
+        if not self._should_sample():
+            # Remember the decision so nested requests don't draw again
+            self._local.state = _UNSAMPLED
+            try:
+                yield
+            finally:
+                self._local.state = None
+            return
+
+        state = _RequestState(threading.get_ident())
+        self._local.state = state
+        self._start_tracing()
+        state.sampler = threading.Thread(target=self._sample_loop, args=(state,), daemon=True)
+        state.sampler.start()
+        try:
+            yield
+        finally:
+            state.stop_event.set()
+            state.sampler.join()
+            self._stop_tracing()
+            self._local.state = None
+            with self._lock:
+                self.sampled_requests += 1
+                should_flush = bool(self.flush_every) and self.sampled_requests >= self.flush_every
+            if should_flush:
+                self.flush()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Attribute samples and allocations inside the block to a named stage"""
+        state = getattr(self._local, "state", None)
+        if state is None or state is _UNSAMPLED:
+            yield
+            return
+
+        start_snapshot = self._take_snapshot(state)
+        self._open_peak_window(state)
+        state.stages.append(name)
+        try:
+            yield
+        finally:
+            state.stages.pop()
+            peak = self._close_peak_window(state)
+            end_snapshot = self._take_snapshot(state)
+            self._record_allocations(name, start_snapshot, end_snapshot, peak)
+
+    def collapsed_stacks(self) -> List[str]:
+        """Get samples as flamegraph-compatible collapsed stack lines"""
+        with self._lock:
+            return [f"{stack} {count}" for stack, count in self.stack_samples.most_common()]
+
+    def allocation_report(self) -> str:
+        """Get per-stage peak memory and the top-N retaining allocation sites as text.
+
+        ``peak`` is the highest traced memory above the stage's starting point, so
+        it includes short-lived allocations. ``retained`` is the net growth
+        between the start and end of the stage, summed over calls.
+        """
+        lines = [f"Sampled requests: {self.sampled_requests}"]
+        with self._lock:
+            for stage_name in sorted(self.stage_calls):
+                calls = self.stage_calls[stage_name]
+                sites = self.allocations.get(stage_name, Counter())
+                blocks = self.allocation_blocks.get(stage_name, Counter())
+                peak_calls = self.stage_peak_calls[stage_name]
+                if peak_calls:
+                    peak = (
+                        f"peak_max={self.stage_peaks[stage_name] / 1024:.1f} KiB "
+                        f"peak_avg={self.stage_peak_totals[stage_name] / peak_calls / 1024:.1f} KiB "
+                        f"peak_calls={peak_calls}"
+                    )
+                else:
+                    peak = "peak=n/a"
+                lines.append("")
+                lines.append(
+                    f"[{stage_name}] calls={calls} {peak} "
+                    f"retained={sum(sites.values()) / 1024:.1f} KiB"
+                )
+                for site, size in sites.most_common(self.top_n):
+                    lines.append(f"  {size / 1024:10.1f} KiB retained  {blocks[site]:8d} blocks  {site}")
+        return "\n".join(lines) + "\n"
+
+    def write_reports(self, output_dir: Optional[Union[str, Path]] = None, prefix: str = "profile") -> Tuple[Path, Path]:
+        """Write collapsed stacks and allocation report, return their paths"""
+        output_dir = Path(output_dir) if output_dir else self.output_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+        stacks_path = output_dir / f"{prefix}_{timestamp}.folded"
+        with open(stacks_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+
+        allocations_path = output_dir / f"{prefix}_{timestamp}_alloc.txt"
+        with open(allocations_path, 'w', encoding='utf-8') as f:
+            f.write(self.allocation_report())
+
+        logger.info(f"Profile written to {stacks_path} and {allocations_path}")
+        return stacks_path, allocations_path
+
+    def flush(self) -> Optional[Tuple[Path, Path]]:
+        """Write reports for the requests sampled so far and start a new window"""
+        with self._flush_lock:
+            if not self.sampled_requests:
+                return None
+            paths = self.write_reports()
+            self.reset()
+            return paths
+
+    def reset(self) -> None:
+        """Drop collected samples and allocation statistics"""
+        with self._lock:
+            self.stack_samples.clear()
+            self.allocations.clear()
+            self.allocation_blocks.clear()
+            self.stage_peaks.clear()
+            self.stage_peak_totals.clear()
+            self.stage_peak_calls.clear()
+            self.stage_calls.clear()
+            self.sampled_requests = 0
+
+    def _should_sample(self) -> bool:
+        return self.sample_rate >= 1 or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def _sample_loop(self, state: _RequestState) -> None:
+        while not state.stop_event.wait(self.interval):
+            if state.paused:
+                continue
+            stages = list(state.stages)
+            frame = sys._current_frames().get(state.thread_id)
+            if frame is None:
+                continue
+            stack = ";".join(stages + self._frame_labels(frame))
+            with self._lock:
+                self.stack_samples[stack] += 1
+
+    def _frame_labels(self, frame) -> List[str]:
+        """Build root-first frame labels, collapsing runs of external frames"""
+        labels: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            if not code.co_filename.endswith(_SKIPPED_FILES):
+                module = frame.f_globals.get("__name__", "?")
+                if self.include_external or code.co_filename.startswith(_PACKAGE_ROOT):
+                    labels.append(f"{module}.{getattr(code, 'co_qualname', code.co_name)}")
+                else:
+                    label = f"[{module.split('.')[0]}]"
+                    if not labels or labels[-1] != label:
+                        labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return labels
+
+    def _take_snapshot(self, state: _RequestState) -> Optional[tracemalloc.Snapshot]:
+        """Snapshot traced memory without charging the cost to stack samples"""
+        if not self._tracing_requests or not tracemalloc.is_tracing():
+            return None
+        state.paused = True
+        try:
+            return tracemalloc.take_snapshot()
+        finally:
+            state.paused = False
+
+    def _open_peak_window(self, state: _RequestState) -> None:
+        """Start tracking peak memory for a stage, preserving enclosing stages' peaks"""
+        if not self._tracing_requests or not tracemalloc.is_tracing():
+            return
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            for window in state.peak_windows:
+                window[1] = max(window[1], peak)
+            # reset_peak() is process-wide; it would corrupt other requests' windows
+            valid = self._tracing_requests == 1
+            if valid:
+                tracemalloc.reset_peak()
+        state.peak_windows.append([current, current, valid])
+
+    def _close_peak_window(self, state: _RequestState) -> Optional[int]:
+        """Return the stage's peak traced memory above its starting point, if reliable"""
+        if not state.peak_windows:
+            return None
+        _, peak = tracemalloc.get_traced_memory()
+        base, window_max, valid = state.peak_windows.pop()
+        for window in state.peak_windows:
+            window[1] = max(window[1], peak)
+        return max(window_max, peak) - base if valid else None
+
+    def _record_allocations(
+            self,
+            stage_name: str,
+            start_snapshot: Optional[tracemalloc.Snapshot],
+            end_snapshot: Optional[tracemalloc.Snapshot],
+            peak: Optional[int] = None
+    ) -> None:
+        with self._lock:
+            self.stage_calls[stage_name] += 1
+            if peak is not None:
+                self.stage_peaks[stage_name] = max(self.stage_peaks[stage_name], peak)
+                self.stage_peak_totals[stage_name] += peak
+                self.stage_peak_calls[stage_name] += 1
+            if start_snapshot is None or end_snapshot is None:
+                return
+            for stat in end_snapshot.compare_to(start_snapshot, "lineno"):
+                frame = stat.traceback[0]
+                if stat.size_diff > 0 and not frame.filename.endswith(_SKIPPED_FILES):
+                    site = f"{frame.filename}:{frame.lineno}"
+                    self.allocations[stage_name][site] += stat.size_diff
+                    self.allocation_blocks[stage_name][site] += stat.count_diff
+
+    def _start_tracing(self) -> None:
+        if not self.trace_memory:
+            return
+        with self._lock:
+            if self._tracing_requests == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._tracing_requests += 1
+
+    def _stop_tracing(self) -> None:
+        if not self.trace_memory:
+            return
+        with self._lock:
+            self._tracing_requests -= 1
+            if self._tracing_requests == 0 and self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False